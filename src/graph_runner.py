@@ -1,18 +1,30 @@
 from langgraph.graph import END, StateGraph
 from src.utils.state import AgentHubState
-from src.utils.nodes import get_architecture, generate_code, check_errors, testing, handle_errors
-from src.utils.routers import error_check_router
+from src.utils.nodes import get_architecture, generate_code, check_errors, testing, handle_errors, fix_pipelines
+from src.utils.routers import error_check_router, fix_mode_router
+from src.utils.events import traced_node
+
+from typing import Any, AsyncIterator, Dict, Iterator
 
 app = StateGraph(AgentHubState)
-app.add_node("get_architecture", get_architecture)
-app.add_node("generate_code", generate_code)
-app.add_node("check_errors", check_errors)
-app.add_node("testing", testing)
-app.add_node("handle_errors", handle_errors)
+app.add_node("get_architecture", traced_node("get_architecture", get_architecture))
+app.add_node("generate_code", traced_node("generate_code", generate_code))
+app.add_node("check_errors", traced_node("check_errors", check_errors))
+app.add_node("testing", traced_node("testing", testing))
+app.add_node("handle_errors", traced_node("handle_errors", handle_errors))
+app.add_node("fix_pipelines", traced_node("fix_pipelines", fix_pipelines))
 
 app.set_entry_point("get_architecture")
 app.add_edge("get_architecture", "generate_code")
-app.add_edge("generate_code", "check_errors")
+app.add_conditional_edges(
+    "generate_code",
+    fix_mode_router,
+    {
+        "check_errors": "check_errors",
+        "fix_pipelines": "fix_pipelines",
+        "testing": "testing",
+    },
+)
 app.add_conditional_edges(
     "check_errors",
     error_check_router,
@@ -23,5 +35,17 @@ app.add_conditional_edges(
 )
 app.add_edge("testing", END)
 app.add_edge("handle_errors", "check_errors")
+app.add_edge("fix_pipelines", "testing")
+
+graph = app.compile()
+
+
+def stream_progress(initial_state: AgentHubState) -> Iterator[Dict[str, Any]]:
+    """Runs the graph and yields its structured progress events."""
+    yield from graph.stream(initial_state, stream_mode="custom")
+
 
-graph = app.compile()
\ No newline at end of file
+async def astream_progress(initial_state: AgentHubState) -> AsyncIterator[Dict[str, Any]]:
+    """Async variant of `stream_progress`."""
+    async for event in graph.astream(initial_state, stream_mode="custom"):
+        yield event
@@ -11,7 +11,8 @@ supervisor_llm = ChatGroq(
 )
 
 
-architecture_llm = supervisor_llm.with_structured_output(ArchitectureStructuredModel)
+# Raw message is kept for token accounting
+architecture_llm = supervisor_llm.with_structured_output(ArchitectureStructuredModel, include_raw=True)
 
 
 codegen_llm = ChatGroq(
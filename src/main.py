@@ -1,4 +1,7 @@
 from src.graph_runner import graph
+from src.utils.events import subscribe, console_subscriber
+
+import os
 
 initial_state = {
     "architecture": {},
@@ -6,6 +9,10 @@ initial_state = {
     "code_generated": False
 }
 
-graph.invoke(initial_state)
-
-
+# Set AGENT_HUB_QUIET=1 to skip console rendering; events are still emitted
+# to the graph's stream writer
+if os.getenv("AGENT_HUB_QUIET"):
+    graph.invoke(initial_state)
+else:
+    with subscribe(console_subscriber):
+        graph.invoke(initial_state)
@@ -0,0 +1,214 @@
+from src.graph_runner import graph
+
+import os
+import time
+import uuid
+import queue
+import shutil
+import threading
+
+from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue has no room for another submission."""
+
+
+@dataclass
+class Job:
+    id: str
+    user_idea: str
+    workspace: str
+    status: str = "queued"  # queued | running | succeeded | failed | cancelled
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    _cond: threading.Condition = field(default_factory=threading.Condition, repr=False)
+
+    @property
+    def project_dir(self) -> str:
+        return os.path.join(self.workspace, "my_project")
+
+    @property
+    def archive_path(self) -> str:
+        return os.path.join(self.workspace, "result.zip")
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed", "cancelled")
+
+    def add_event(self, event: Dict[str, Any]):
+        with self._cond:
+            self.events.append(event)
+            self._cond.notify_all()
+
+    def set_status(self, status: str, **fields):
+        with self._cond:
+            self.status = status
+            for key, value in fields.items():
+                setattr(self, key, value)
+            self.events.append({"event": "job_status", "status": status, "ts": time.time()})
+            self._cond.notify_all()
+
+    def wait_for_events(self, cursor: int, timeout: float = 15.0) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Blocks until there are events past `cursor` or the job is done.
+        Returns the new events and whether the job has finished.
+        """
+        with self._cond:
+            if cursor >= len(self.events) and not self.done:
+                self._cond.wait(timeout)
+            return self.events[cursor:], self.done
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "user_idea": self.user_idea,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+def summarize_state(state: Dict[str, Any], project_dir: str) -> Dict[str, Any]:
+    """JSON-friendly view of the final graph state."""
+    architecture = state.get("architecture")
+    if hasattr(architecture, "model_dump"):
+        architecture = architecture.model_dump()
+
+    files = []
+    if os.path.exists(project_dir):
+        for root, _, names in os.walk(project_dir):
+            for name in names:
+                files.append(os.path.relpath(os.path.join(root, name), project_dir))
+
+    return {
+        "architecture": architecture,
+        "code_generated": state.get("code_generated", False),
+        "iteration_count": state.get("iteration_count", 0),
+        "errors": state.get("errors", {}),
+        "usage": state.get("usage", {}),
+        "files": sorted(files),
+    }
+
+
+class JobManager:
+    """
+    Runs the compiled graph for submitted ideas on a fixed pool of worker
+    threads, fed by a bounded queue. Each job gets its own workspace.
+    """
+
+    def __init__(self, workspace_root: str = "workspace", workers: int = 2,
+                 queue_size: int = 16, max_finished_jobs: int = 1000):
+        self.workspace_root = os.path.abspath(workspace_root)
+        self.workers = workers
+        self.max_finished_jobs = max_finished_jobs
+        self._queue: "queue.Queue[Optional[Job]]" = queue.Queue(maxsize=queue_size)
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        os.makedirs(self.workspace_root, exist_ok=True)
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"agent-hub-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def shutdown(self):
+        """Cancels queued jobs and waits for the running ones to finish."""
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                job.set_status("cancelled", finished_at=time.time())
+            self._queue.task_done()
+
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def submit(self, user_idea: str) -> Job:
+        job_id = uuid.uuid4().hex
+        job = Job(id=job_id, user_idea=user_idea, workspace=os.path.join(self.workspace_root, job_id))
+        # Registered before it is queued, so a worker never runs a job get() can't see
+        with self._lock:
+            self._jobs[job_id] = job
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                del self._jobs[job_id]
+                raise QueueFullError(f"Job queue is full ({self._queue.maxsize} pending)")
+            self._evict_finished()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            running = sum(1 for job in self._jobs.values() if job.status == "running")
+        return {
+            "workers": self.workers,
+            "running": running,
+            "queued": self._queue.qsize(),
+            "queue_size": self._queue.maxsize,
+        }
+
+    def _evict_finished(self):
+        finished = [job for job in self._jobs.values() if job.done]
+        for job in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job.id]
+            shutil.rmtree(job.workspace, ignore_errors=True)
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            try:
+                self._run(job)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job: Job):
+        job.set_status("running", started_at=time.time())
+        os.makedirs(job.workspace, exist_ok=True)
+
+        initial_state = {
+            "architecture": {},
+            "user_idea": job.user_idea,
+            "code_generated": False,
+            "project_dir": job.project_dir,
+        }
+
+        try:
+            final_state = initial_state
+            for mode, chunk in graph.stream(initial_state, stream_mode=["custom", "values"]):
+                if mode == "values":
+                    final_state = chunk
+                else:
+                    job.add_event(chunk)
+
+            if os.path.exists(job.project_dir):
+                shutil.make_archive(job.archive_path[:-len(".zip")], "zip", job.project_dir)
+
+            job.set_status(
+                "succeeded",
+                result=summarize_state(final_state, job.project_dir),
+                finished_at=time.time(),
+            )
+        except Exception as e:
+            job.set_status("failed", error=str(e), finished_at=time.time())
@@ -0,0 +1,159 @@
+from src.service.jobs import JobManager, QueueFullError
+from dotenv import load_dotenv
+
+import os
+import re
+import json
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+load_dotenv()
+
+
+JOB_ROUTE = re.compile(r"^/jobs/([0-9a-f]{32})(/result|/events|/archive)?/?$")
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """
+    Routes:
+    - POST /jobs                 submit {"user_idea": "..."}
+    - GET  /jobs/<id>            job status
+    - GET  /jobs/<id>/result     final result once the job finished
+    - GET  /jobs/<id>/events     progress as a server-sent event stream
+    - GET  /jobs/<id>/archive    generated project as a zip archive
+    - GET  /health               worker and queue stats
+    """
+
+    manager: JobManager = None
+
+    def _send_json(self, status: int, payload, headers: dict = None):
+        body = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/jobs":
+            self._send_json(404, {"error": "Not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, json.JSONDecodeError):
+            self._send_json(400, {"error": "Body must be valid JSON"})
+            return
+
+        user_idea = payload.get("user_idea") if isinstance(payload, dict) else None
+        if not isinstance(user_idea, str) or not user_idea.strip():
+            self._send_json(400, {"error": "'user_idea' must be a non-empty string"})
+            return
+
+        try:
+            job = self.manager.submit(user_idea.strip())
+        except QueueFullError as e:
+            self._send_json(503, {"error": str(e)}, headers={"Retry-After": "30"})
+            return
+
+        self._send_json(202, job.to_dict(), headers={"Location": f"/jobs/{job.id}"})
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/health":
+            self._send_json(200, self.manager.stats())
+            return
+
+        match = JOB_ROUTE.match(self.path)
+        job = self.manager.get(match.group(1)) if match else None
+        if job is None:
+            self._send_json(404, {"error": "Job not found"})
+            return
+
+        action = match.group(2)
+        if action is None:
+            self._send_json(200, job.to_dict())
+        elif action == "/result":
+            self._send_result(job)
+        elif action == "/events":
+            self._stream_events(job)
+        else:
+            self._send_archive(job)
+
+    def _send_result(self, job):
+        if not job.done:
+            self._send_json(409, {"error": f"Job is {job.status}", **job.to_dict()})
+        elif job.status != "succeeded":
+            # The job failed or was cancelled, the request itself worked
+            self._send_json(200, job.to_dict())
+        else:
+            self._send_json(200, {**job.to_dict(), "result": job.result})
+
+    def _send_archive(self, job):
+        if job.status != "succeeded" or not os.path.exists(job.archive_path):
+            self._send_json(409, {"error": "Archive not available", **job.to_dict()})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/zip")
+        self.send_header("Content-Length", str(os.path.getsize(job.archive_path)))
+        self.send_header("Content-Disposition", f'attachment; filename="{job.id}.zip"')
+        self.end_headers()
+        with open(job.archive_path, "rb") as f:
+            while chunk := f.read(64 * 1024):
+                self.wfile.write(chunk)
+
+    def _stream_events(self, job):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        cursor = 0
+        try:
+            while True:
+                events, done = job.wait_for_events(cursor)
+                for event in events:
+                    self.wfile.write(f"data: {json.dumps(event, default=str)}\n\n".encode("utf-8"))
+                cursor += len(events)
+                if not events and not done:
+                    # Keep idle connections alive through proxies
+                    self.wfile.write(b": keep-alive\n\n")
+                self.wfile.flush()
+                if done and not events:
+                    break
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def serve():
+    host = os.getenv("AGENT_HUB_HOST", "127.0.0.1")
+    port = int(os.getenv("AGENT_HUB_PORT", "8000"))
+
+    manager = JobManager(
+        workspace_root=os.getenv("AGENT_HUB_WORKSPACE", "workspace"),
+        workers=int(os.getenv("AGENT_HUB_WORKERS", "2")),
+        queue_size=int(os.getenv("AGENT_HUB_QUEUE_SIZE", "16")),
+        max_finished_jobs=int(os.getenv("AGENT_HUB_MAX_FINISHED_JOBS", "1000")),
+    )
+    manager.start()
+
+    JobRequestHandler.manager = manager
+    server = ThreadingHTTPServer((host, port), JobRequestHandler)
+    server.daemon_threads = True
+    print(f"🚀 AutoAgentHub job service listening on http://{host}:{port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        manager.shutdown()
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,235 @@
+from src.structured_models.architecture import ArchitectureStructuredModel
+
+import os
+import re
+import math
+import time
+import sqlite3
+import threading
+
+from typing import Dict, List, Optional, Set, Tuple
+from collections import Counter, OrderedDict
+
+
+STOPWORDS = {
+    "a", "an", "and", "any", "app", "build", "can", "create", "for", "from", "i", "in",
+    "into", "is", "it", "make", "me", "my", "of", "on", "our", "please", "that", "the",
+    "this", "to", "we", "which", "with", "want", "need", "you", "your",
+    # Nearly every idea asks for one, so they say nothing about the architecture
+    "agent", "assistant", "system", "tool",
+}
+
+# Interchangeable names that lead to the same architecture
+ALIASES = {
+    "postgres": "database", "postgresql": "database", "mysql": "database", "sqlite": "database",
+    "db": "database", "databases": "database",
+    "bot": "chatbot", "chat": "chatbot",
+    "doc": "document", "docs": "document",
+}
+
+
+# Chosen on the README use cases as stored ideas: rephrasings such as
+# "SQL agent for Postgres" vs "sql agent for my database" score 0.55-1.0,
+# while different ideas sharing words with a stored one ("sql injection
+# scanner for my database", "pull request merge bot") stay at or below 0.4.
+DEFAULT_THRESHOLD = 0.5
+
+# Tokens found in more entries than this ("database", "chatbot") are too
+# common to collect candidates from on their own
+COMMON_TOKEN_ENTRIES = 500
+
+
+def normalize_idea(text: str) -> str:
+    """Lowercases and strips punctuation / extra whitespace."""
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text.lower()).split())
+
+
+def stem(word: str) -> str:
+    """Very small suffix stripper: searches/searching/searched -> search."""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(word) - len(suffix) >= 4 and word.endswith(suffix) and not word.endswith("ss"):
+            word = word[:-len(suffix)]
+            break
+    # analyze / analyzes -> analyz
+    if len(word) > 4 and word.endswith("e"):
+        word = word[:-1]
+    return word
+
+
+def tokenize_idea(text: str) -> List[str]:
+    """Content words of an idea, aliased and stemmed."""
+    tokens = []
+    for word in normalize_idea(text).split():
+        word = ALIASES.get(word, word)
+        if word in STOPWORDS:
+            continue
+        tokens.append(stem(word))
+    return tokens
+
+
+class ArchitectureCache:
+    """
+    Local store of supervisor architectures keyed by user idea.
+
+    Lookups first try an exact match on the normalized idea, then a TF-IDF
+    cosine similarity over an in-memory inverted index. Only the token
+    weights live in memory; architectures are persisted in SQLite and the
+    least recently used entries are evicted past `max_entries`.
+
+    Entry weights are computed when an entry is indexed and recomputed for
+    all entries whenever the cache doubles in size, so their IDF stays
+    close to the current one without reweighting on every lookup.
+    """
+
+    def __init__(self, path: str = ":memory:", max_entries: int = 20000, threshold: float = DEFAULT_THRESHOLD):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Counter]" = OrderedDict()
+        self._postings: Dict[str, Set[str]] = {}
+        self._vectors: Dict[str, Tuple[Dict[str, float], float]] = {}
+        self._weighted_size = 1
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS architectures ("
+            "key TEXT PRIMARY KEY, idea TEXT, architecture TEXT, last_used REAL)"
+        )
+        for key, idea in self._db.execute("SELECT key, idea FROM architectures ORDER BY last_used"):
+            self._index(key, idea)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _index(self, key: str, idea: str):
+        tokens = Counter(tokenize_idea(idea))
+        self._entries[key] = tokens
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(key)
+        self._vectors[key] = self._vector(tokens)
+        if len(self._entries) >= 2 * self._weighted_size:
+            self._reweight()
+
+    def _unindex(self, key: str):
+        del self._vectors[key]
+        for token in self._entries.pop(key):
+            keys = self._postings[token]
+            keys.discard(key)
+            if not keys:
+                del self._postings[token]
+
+    def _reweight(self):
+        for key, tokens in self._entries.items():
+            self._vectors[key] = self._vector(tokens)
+        self._weighted_size = max(1, len(self._entries))
+
+    def _idf(self, token: str) -> float:
+        df = len(self._postings.get(token, ()))
+        return math.log((1 + len(self._entries)) / (1 + df)) + 1
+
+    def _vector(self, tokens: Counter) -> Tuple[Dict[str, float], float]:
+        weights = {token: count * self._idf(token) for token, count in tokens.items()}
+        return weights, math.sqrt(sum(w * w for w in weights.values()))
+
+    def _candidates(self, tokens: Counter) -> Set[str]:
+        postings = [self._postings[token] for token in tokens if token in self._postings]
+        rare = [keys for keys in postings if len(keys) <= COMMON_TOKEN_ENTRIES]
+        if rare:
+            return set().union(*rare)
+        # Only common words: a match has to contain the two rarest of them
+        if len(postings) < 2:
+            return set()
+        postings.sort(key=len)
+        return postings[0] & postings[1]
+
+    def _best_match(self, tokens: Counter) -> Tuple[Optional[str], float]:
+        query, query_norm = self._vector(tokens)
+        if not query_norm:
+            return None, 0.0
+
+        best_key, best_score = None, 0.0
+        for key in self._candidates(tokens):
+            doc, doc_norm = self._vectors[key]
+            shared = [token for token in query if token in doc]
+            # A single shared word ("database", "sql") is not the same idea
+            if len(shared) < min(2, len(query.keys() | doc.keys())):
+                continue
+            dot = sum(query[token] * doc[token] for token in shared)
+            # Discount words only one side has: "sql injection scanner for my
+            # database" is not a "sql agent for my database"
+            query_coverage = math.sqrt(sum(query[token] ** 2 for token in shared)) / query_norm
+            doc_coverage = math.sqrt(sum(doc[token] ** 2 for token in shared)) / doc_norm
+            score = dot / (query_norm * doc_norm) * query_coverage * doc_coverage
+            if score > best_score:
+                best_key, best_score = key, score
+        return best_key, best_score
+
+    def lookup(self, user_idea: str) -> Optional[Tuple[ArchitectureStructuredModel, float]]:
+        """Returns the cached architecture and its similarity, if above threshold."""
+        key = normalize_idea(user_idea)
+        with self._lock:
+            if key in self._entries:
+                match, score = key, 1.0
+            else:
+                match, score = self._best_match(Counter(tokenize_idea(user_idea)))
+            if match is None or score < self.threshold:
+                return None
+
+            self._entries.move_to_end(match)
+            row = self._db.execute("SELECT architecture FROM architectures WHERE key = ?", (match,)).fetchone()
+            self._db.execute("UPDATE architectures SET last_used = ? WHERE key = ?", (time.time(), match))
+            self._db.commit()
+
+        if row is None:
+            return None
+        return ArchitectureStructuredModel.model_validate_json(row[0]), score
+
+    def store(self, user_idea: str, architecture: ArchitectureStructuredModel):
+        key = normalize_idea(user_idea)
+        if not key:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._unindex(key)
+            self._index(key, user_idea)
+            self._db.execute(
+                "INSERT OR REPLACE INTO architectures (key, idea, architecture, last_used) VALUES (?, ?, ?, ?)",
+                (key, user_idea, architecture.model_dump_json(), time.time()),
+            )
+
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._unindex(oldest)
+                self._db.execute("DELETE FROM architectures WHERE key = ?", (oldest,))
+            self._db.commit()
+
+
+_cache: Optional[ArchitectureCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_architecture_cache() -> Optional[ArchitectureCache]:
+    """
+    Process-wide cache configured from the environment:
+    - AGENT_HUB_ARCH_CACHE: SQLite path, ":memory:" or "off"
+    - AGENT_HUB_ARCH_CACHE_THRESHOLD: minimum similarity for a hit (default 0.5)
+    - AGENT_HUB_ARCH_CACHE_SIZE: maximum number of entries (default 20000)
+    """
+    global _cache
+    path = os.getenv("AGENT_HUB_ARCH_CACHE", ".agent_hub_cache/architectures.sqlite3")
+    if path.lower() == "off":
+        return None
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = ArchitectureCache(
+                path=path,
+                max_entries=int(os.getenv("AGENT_HUB_ARCH_CACHE_SIZE", "20000")),
+                threshold=float(os.getenv("AGENT_HUB_ARCH_CACHE_THRESHOLD", DEFAULT_THRESHOLD)),
+            )
+        return _cache
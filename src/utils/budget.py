@@ -0,0 +1,170 @@
+from src.utils.state import AgentHubState
+from src.utils.events import emit
+from langchain_core.callbacks import BaseCallbackHandler
+from dotenv import load_dotenv
+
+import os
+import time
+import threading
+
+from typing import Any, Dict, Iterable, Optional
+
+
+load_dotenv()
+
+
+# Final message of LangGraph's prebuilt ReAct agent when it runs out of steps
+AGENT_OUT_OF_STEPS = "Sorry, need more steps to process this request."
+
+
+class AgentStepLimitError(Exception):
+    """Raised when the fixing agent hits max_agent_steps before answering."""
+
+
+class BudgetExhaustedError(Exception):
+    """Raised when the run's budget runs out while the fixing agent works."""
+
+
+# Usage is updated from pipeline worker threads as well
+_lock = threading.Lock()
+
+
+def _env_limit(name: str, cast=int):
+    value = os.getenv(name)
+    return cast(value) if value else None
+
+
+def init_budget(state: AgentHubState):
+    """
+    Fills in state['budget'] from the environment for any limit not given
+    in the initial state, and starts the usage counters. None means unlimited.
+    - max_tokens: total LLM tokens (AGENT_HUB_MAX_TOKENS)
+    - max_seconds: wall-clock time for the run (AGENT_HUB_MAX_SECONDS)
+    - max_llm_calls: LLM requests across all nodes (AGENT_HUB_MAX_LLM_CALLS)
+    - max_agent_steps: tool steps the fixing agent may take per fix (AGENT_HUB_MAX_AGENT_STEPS)
+    """
+    budget = dict(state.get("budget") or {})
+    budget.setdefault("max_tokens", _env_limit("AGENT_HUB_MAX_TOKENS"))
+    budget.setdefault("max_seconds", _env_limit("AGENT_HUB_MAX_SECONDS", float))
+    budget.setdefault("max_llm_calls", _env_limit("AGENT_HUB_MAX_LLM_CALLS"))
+    budget.setdefault("max_agent_steps", _env_limit("AGENT_HUB_MAX_AGENT_STEPS"))
+    if budget.get("deadline") is None and budget["max_seconds"] is not None:
+        budget["deadline"] = time.time() + budget["max_seconds"]
+
+    state["budget"] = budget
+    state["usage"] = {"tokens": 0, "llm_calls": 0, "exhausted": None}
+
+
+def _add_usage(state: AgentHubState, calls: int, tokens: int):
+    with _lock:
+        usage = state.setdefault("usage", {"tokens": 0, "llm_calls": 0, "exhausted": None})
+        usage["llm_calls"] += calls
+        usage["tokens"] += tokens
+
+
+def record_llm_usage(state: AgentHubState, messages: Iterable[Any]):
+    """Counts the LLM calls and tokens behind the given AI messages."""
+    calls, tokens = 0, 0
+    for message in messages:
+        if getattr(message, "type", None) != "ai":
+            continue
+        calls += 1
+        usage_metadata = getattr(message, "usage_metadata", None)
+        if usage_metadata:
+            tokens += usage_metadata.get("total_tokens", 0)
+    _add_usage(state, calls, tokens)
+
+
+def mark_exhausted(state: AgentHubState, reason: str):
+    with _lock:
+        usage = state.setdefault("usage", {"tokens": 0, "llm_calls": 0, "exhausted": None})
+        if usage["exhausted"]:
+            return
+        usage["exhausted"] = reason
+    emit("budget_exhausted", reason=reason, tokens=usage["tokens"], llm_calls=usage["llm_calls"])
+
+
+def budget_exhausted(state: AgentHubState) -> Optional[str]:
+    """Returns why the run is out of budget, or None if it may keep going."""
+    usage = state.get("usage") or {}
+    if usage.get("exhausted"):
+        return usage["exhausted"]
+
+    budget = state.get("budget") or {}
+    reason = None
+    if budget.get("deadline") is not None and time.time() >= budget["deadline"]:
+        reason = "wall_time"
+    elif budget.get("max_tokens") is not None and usage.get("tokens", 0) >= budget["max_tokens"]:
+        reason = "tokens"
+    elif budget.get("max_llm_calls") is not None and usage.get("llm_calls", 0) >= budget["max_llm_calls"]:
+        reason = "llm_calls"
+
+    if reason:
+        mark_exhausted(state, reason)
+    return reason
+
+
+def time_left(state: AgentHubState) -> Optional[float]:
+    """Seconds until the run's deadline, or None without a wall-time limit."""
+    deadline = (state.get("budget") or {}).get("deadline")
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.time())
+
+
+class BudgetCallbackHandler(BaseCallbackHandler):
+    """
+    Counts the fixing agent's LLM calls as they finish and stops the agent
+    before its next model or tool call once the run is out of budget.
+    """
+
+    # Let the exception end the agent run instead of being logged
+    raise_error = True
+
+    def __init__(self, state: AgentHubState):
+        self.state = state
+
+    def _check(self):
+        reason = budget_exhausted(self.state)
+        if reason:
+            raise BudgetExhaustedError(reason)
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        self._check()
+
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        self._check()
+
+    def on_tool_start(self, serialized, input_str, **kwargs):
+        self._check()
+
+    def on_llm_end(self, response, **kwargs):
+        tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage_metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage_metadata:
+                    tokens += usage_metadata.get("total_tokens", 0)
+        _add_usage(self.state, 1, tokens)
+
+
+def agent_config(state: AgentHubState) -> Dict[str, Any]:
+    """
+    Run config keeping the fixing agent within the run's budget: usage is
+    counted per LLM call, and the step cap allows no more model calls than
+    max_agent_steps or the remaining max_llm_calls.
+    """
+    budget = state.get("budget") or {}
+    usage = state.get("usage") or {}
+    config: Dict[str, Any] = {"callbacks": [BudgetCallbackHandler(state)]}
+
+    # Each tool step is a model turn plus a tool turn, then one final answer
+    limits = []
+    if budget.get("max_agent_steps") is not None:
+        limits.append(2 * budget["max_agent_steps"] + 1)
+    if budget.get("max_llm_calls") is not None:
+        calls_left = max(1, budget["max_llm_calls"] - usage.get("llm_calls", 0))
+        limits.append(2 * calls_left - 1)
+    if limits:
+        config["recursion_limit"] = min(limits)
+    return config
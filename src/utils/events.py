@@ -0,0 +1,157 @@
+from langgraph.config import get_stream_writer
+
+import time
+import functools
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Tuple
+
+
+Event = Dict[str, Any]
+Subscriber = Callable[[Event], None]
+
+
+# Subscribers are scoped to the current context, so concurrent runs (e.g. the
+# job service workers) each only see their own events.
+_subscribers: ContextVar[Tuple[Subscriber, ...]] = ContextVar("agent_hub_subscribers", default=())
+
+
+def _stream_writer():
+    """LangGraph custom stream writer for the running node, if any."""
+    try:
+        return get_stream_writer()
+    except RuntimeError:
+        # Called outside of a graph run
+        return None
+
+
+@contextmanager
+def subscribe(subscriber: Subscriber):
+    """Delivers every event emitted in this context to `subscriber`."""
+    token = _subscribers.set(_subscribers.get() + (subscriber,))
+    try:
+        yield
+    finally:
+        _subscribers.reset(token)
+
+
+def emit(event: str, **data):
+    """
+    Publishes a structured progress event to LangGraph's `custom` stream
+    mode and to the subscribers of the current context.
+    Outside a graph run with no subscribers nothing is built. Inside a node
+    LangGraph always hands out a writer (a no-op unless the run streams in
+    `custom` mode), so events are built there even when nothing consumes them.
+    """
+    subscribers = _subscribers.get()
+    writer = _stream_writer()
+    if not subscribers and writer is None:
+        return
+
+    payload = {"event": event, "ts": time.time(), **data}
+    if writer is not None:
+        writer(payload)
+    for subscriber in subscribers:
+        subscriber(payload)
+
+
+def traced_node(name: str, node: Callable):
+    """Wraps a graph node so it emits node_started / node_finished events."""
+
+    @functools.wraps(node)
+    def wrapper(state, *args, **kwargs):
+        emit("node_started", node=name)
+        started = time.perf_counter()
+        result = node(state, *args, **kwargs)
+        emit("node_finished", node=name, duration=time.perf_counter() - started)
+        return result
+
+    return wrapper
+
+
+def console_subscriber(event: Event):
+    """Renders events as human readable console lines."""
+    kind = event["event"]
+
+    if kind == "node_started":
+        print(f"▶️  {event['node']}")
+    elif kind == "node_finished":
+        print(f"⏹️  {event['node']} finished in {event['duration']:.1f}s")
+    elif kind == "architecture_cache_hit":
+        print(f"♻️  Reusing cached architecture (similarity {event['similarity']:.2f})")
+    elif kind == "tool_loaded":
+        print(f"✅ {event['tool']} search tool loaded")
+    elif kind == "tool_unavailable":
+        print(f"⚠️  {event['tool']} not available: {event['error']}")
+    elif kind == "code_written":
+        print(f"✅ Code written to: {event['project_dir']} ({event['file_count']} files)")
+    elif kind == "no_files_parsed":
+        print("⚠️  No files parsed from LLM output.")
+    elif kind == "file_rejected":
+        print(f"⚠️  Skipped {event['path']}: {event['reason']}")
+    elif kind == "project_missing":
+        print(f"❌ Directory {event['project_dir']} does not exist!")
+    elif kind == "file_analyzed":
+        errors = event["errors"]
+        previous = event["previous_count"]
+        if not errors:
+            print(f"📄 {event['file']}: ✅ no errors found")
+        elif previous:
+            trend = "✅ improved" if len(errors) < previous else "⚠️  worse" if len(errors) > previous else "⚡ same"
+            print(f"📄 {event['file']}: {trend} {previous} → {len(errors)} errors")
+        else:
+            print(f"📄 {event['file']}: ❌ found {len(errors)} issue(s)")
+        for i, error in enumerate(errors[:2], 1):
+            print(f"      {i}. {error}")
+        if len(errors) > 2:
+            print(f"      ... and {len(errors) - 2} more")
+    elif kind == "file_analysis_failed":
+        print(f"📄 {event['file']}: ⚠️  error analyzing file: {event['error']}")
+    elif kind == "errors_found":
+        print("=" * 60)
+        print(f"📊 Analysis Summary (Iteration {event['iteration']}):")
+        print(f"   Total files analyzed: {event['total_files']}")
+        print(f"   Files with issues: {event['files_with_errors']}")
+        if event["iteration"] > 0:
+            print(f"   Errors: {event['previous_total']} → {event['total_errors']}")
+        print("=" * 60)
+    elif kind == "file_rolled_back":
+        print(f"⏪ {event['file']}: fix made it worse, restored best version ({event['errors']} errors)")
+    elif kind == "best_versions_restored":
+        print(f"⏪ Restored best version of {len(event['files'])} file(s)")
+    elif kind == "fix_applied":
+        search_note = f", used {event['searches']} search(es)" if event["searches"] else ""
+        print(f"🔧 {event['file']}: fixed {event['error_count']} error(s){search_note}, "
+              f"lines {event['lines_before']} → {event['lines_after']}")
+    elif kind == "fix_failed":
+        print(f"🔧 {event['file']}: ❌ {event['reason']}")
+    elif kind == "search_prefetched":
+        print(f"🔍 Prefetched {event['completed']}/{event['queries']} search(es) for {event['files']} file(s)")
+    elif kind == "search_failed":
+        print(f"⚠️  Search failed for '{event['query']}' ({event['tool']}): {event['error']}")
+    elif kind == "search_used":
+        print(f"🔍 {event['file']}: {event['count']} search(es)")
+    elif kind == "pipeline_finished":
+        print(f"🏁 {event['file']}: {event['errors']} error(s) left after {event['iterations']} fix round(s)")
+    elif kind == "interface_changed":
+        print(f"🔗 Public interface changed in {', '.join(event['files'])}; "
+              f"re-checking {', '.join(event['rechecking'])}")
+    elif kind == "fix_summary":
+        print("=" * 60)
+        print(f"📊 Fixing Summary (Iteration {event['iteration']}): "
+              f"{len(event['fixed'])} fixed, {len(event['failed'])} failed, "
+              f"{event['errors_addressed']} errors addressed")
+        print("=" * 60)
+    elif kind == "max_iterations":
+        print(f"⚠️  Reached maximum iterations ({event['limit']}). Stopping.")
+    elif kind == "agent_unavailable":
+        print(f"❌ Failed to create agent: {event['error']}")
+    elif kind == "budget_exhausted":
+        print(f"⏱️  Budget exhausted ({event['reason']}) after {event['llm_calls']} LLM call(s), "
+              f"{event['tokens']} token(s). Finishing with a partial result.")
+    elif kind == "completed":
+        if event["code_generated"]:
+            print("Ready with production ready code")
+        else:
+            print("⚠️  Finished with remaining errors")
@@ -0,0 +1,89 @@
+import os
+import ast
+
+from typing import FrozenSet, List, Optional, Set
+
+
+def public_interface(relative_path: str, code: str) -> Optional[FrozenSet[str]]:
+    """
+    Top-level public names of a Python module, with function signatures.
+    Returns None for non-Python files or code that does not parse.
+    """
+    if not relative_path.endswith(".py"):
+        return None
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return None
+
+    names = set()
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and not node.name.startswith("_"):
+            names.add(f"def {node.name}({ast.unparse(node.args)})")
+        elif isinstance(node, ast.ClassDef) and not node.name.startswith("_"):
+            methods = [
+                f"{item.name}({ast.unparse(item.args)})" for item in node.body
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+                and (not item.name.startswith("_") or item.name == "__init__")
+            ]
+            names.add(f"class {node.name}: {', '.join(methods)}")
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                if isinstance(target, ast.Name) and not target.id.startswith("_"):
+                    names.add(target.id)
+    return frozenset(names)
+
+
+def module_names(relative_path: str) -> Set[str]:
+    """Dotted names a file can be imported as, e.g. src/db/client.py -> src.db.client, db.client, client."""
+    parts = relative_path[:-len(".py")].replace(os.sep, "/").split("/")
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    return {".".join(parts[i:]) for i in range(len(parts))}
+
+
+def imported_modules(relative_path: str, code: str) -> Set[str]:
+    """Dotted module names imported by a Python file, with relative imports resolved."""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return set()
+
+    package = relative_path.replace(os.sep, "/").split("/")[:-1]
+    modules = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module.split(".") if node.module else []
+            if node.level:
+                base = package[:len(package) - (node.level - 1)] + base
+            if base:
+                modules.add(".".join(base))
+            # `from pkg import module` imports a submodule
+            modules.update(".".join(base + [alias.name]) for alias in node.names)
+    return modules
+
+
+def find_dependents(base_dir: str, paths: List[str], changed: List[str]) -> List[str]:
+    """Python files among `paths` that import one of the `changed` modules."""
+    changed_names = set()
+    for path in changed:
+        if path.endswith(".py"):
+            changed_names |= module_names(path)
+    if not changed_names:
+        return []
+
+    dependents = []
+    for path in paths:
+        if not path.endswith(".py"):
+            continue
+        try:
+            with open(os.path.join(base_dir, path), "r", encoding="utf-8") as f:
+                code = f.read()
+        except OSError:
+            continue
+        if imported_modules(path, code) & (changed_names - module_names(path)):
+            dependents.append(path)
+    return dependents
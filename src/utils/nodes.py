@@ -1,21 +1,68 @@
 from src.utils.state import AgentHubState
 from src.llm.llms import architecture_llm, codegen_llm, error_analysis_llm
 from src.utils.prompts import architecture_prompt, codegen_prompt, error_analysis_prompt, fix_errors_prompt
-from src.utils.tools import create_error_fixing_agent
+from src.utils.tools import create_error_fixing_agent, setup_search_tools
+from src.utils.search_prefetch import SearchPrefetcher
+from src.utils.events import emit
+from src.utils.architecture_cache import get_architecture_cache
+from src.structured_models.architecture import ArchitectureStructuredModel
+from src.utils.snapshots import SnapshotStore, track_best_versions, restore_best_versions
+from src.utils.interfaces import public_interface, find_dependents
+from src.utils.budget import (
+    init_budget, record_llm_usage, budget_exhausted, agent_config, time_left,
+    AgentStepLimitError, BudgetExhaustedError, AGENT_OUT_OF_STEPS,
+)
+from langgraph.errors import GraphRecursionError
 
 import os
 import re
 import json
 import shutil
+import contextvars
 
-from typing import List, Dict
+from typing import Any, List, Dict, Iterator, Optional, Tuple
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+DEFAULT_PROJECT_DIR = "my_project"
+
+# Fix/verify rounds per run (batch mode) or per file (pipeline mode)
+MAX_ITERATIONS = 5
+
+# Files fixed concurrently in pipeline mode
+PIPELINE_WORKERS = int(os.getenv("AGENT_HUB_PIPELINE_WORKERS", "4"))
+
+# Searches run up front for the fixing agent (0 queries disables prefetch)
+PREFETCH_MAX_QUERIES = int(os.getenv("AGENT_HUB_PREFETCH_MAX_QUERIES", "3"))
+PREFETCH_WORKERS = int(os.getenv("AGENT_HUB_PREFETCH_WORKERS", "8"))
+
+
+def get_project_dir(state: AgentHubState) -> str:
+    """Directory the generated project lives in for this run."""
+    return state.get("project_dir") or DEFAULT_PROJECT_DIR
 
 
 # Architecture node
 
 def get_architecture(state: AgentHubState):
-    response = architecture_llm.invoke(architecture_prompt(state['user_idea']))
+    init_budget(state)
+
+    cache = get_architecture_cache()
+    cached = cache.lookup(state['user_idea']) if cache else None
+    if cached is not None:
+        architecture, similarity = cached
+        emit("architecture_cache_hit", similarity=similarity)
+        state['architecture'] = architecture
+        return state
+
+    result = architecture_llm.invoke(architecture_prompt(state['user_idea']))
+    record_llm_usage(state, [result["raw"]])
+    if result.get("parsing_error"):
+        raise result["parsing_error"]
+    response = result["parsed"]
+    if cache and isinstance(response, ArchitectureStructuredModel):
+        cache.store(state['user_idea'], response)
     state['architecture'] = response
     return state
 
@@ -88,45 +135,55 @@ def parse_files_from_response(response_text: str) -> List[Dict[str, str]]:
     return files
 
 
-def write_files_to_directory(files: List[Dict[str, str]], base_dir: str = "my_project"):
+def write_files_to_directory(files: List[Dict[str, str]], base_dir: str = DEFAULT_PROJECT_DIR):
     """
     Writes parsed files into a base directory.
-    Automatically detects project root folder name if present.
+    Automatically detects a project root folder name in the LLM paths and
+    strips it, so files always land inside base_dir.
     """
     if not files:
-        print("⚠️  No files parsed from LLM output.")
+        emit("no_files_parsed")
         return
 
+    root_prefix = ""
     first_path = files[0]["path"]
     if "/" in first_path:
         detected_root = first_path.split("/")[0]
         if detected_root not in ["src", "app", "lib", "tests", "docs"]:
-            base_dir = detected_root
-    
-    # print(f"📁 Using base directory: {base_dir}")
+            root_prefix = detected_root + "/"
 
     if os.path.exists(base_dir):
         shutil.rmtree(base_dir)
-        # print(f"🗑️  Removed existing directory: {base_dir}")
     
     os.makedirs(base_dir, exist_ok=True)
+    real_base_dir = os.path.realpath(base_dir)
 
-    for idx, file in enumerate(files, 1):
+    written = 0
+    for file in files:
         relative_path = file["path"]
         
-        if relative_path.startswith(base_dir + "/"):
+        # Paths come from model output, never let them escape base_dir
+        if os.path.isabs(relative_path):
+            emit("file_rejected", path=relative_path, reason="absolute path")
+            continue
+        
+        if root_prefix and relative_path.startswith(root_prefix):
+            relative_path = relative_path[len(root_prefix):]
+        elif relative_path.startswith(base_dir + "/"):
             relative_path = relative_path[len(base_dir) + 1:]
 
-        file_path = os.path.join(base_dir, relative_path)
+        file_path = os.path.realpath(os.path.join(real_base_dir, relative_path))
+        if os.path.commonpath([real_base_dir, file_path]) != real_base_dir or file_path == real_base_dir:
+            emit("file_rejected", path=file["path"], reason="outside the project directory")
+            continue
         
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
         with open(file_path, "w", encoding="utf-8") as f:
             f.write(file["content"])
-        
-        # print(f"   [{idx}/{len(files)}] ✅ {relative_path} ({len(file['content'])} chars)")
+        written += 1
 
-    print(f"\n✅ Code written to: {os.path.abspath(base_dir)}")
+    emit("code_written", project_dir=os.path.abspath(base_dir), file_count=written)
 
 
 def generate_code(state: AgentHubState) -> AgentHubState:
@@ -136,171 +193,267 @@ def generate_code(state: AgentHubState) -> AgentHubState:
     """
     architecture = state["architecture"]
 
-    print("🚀 Entered code generation node...")
+    if budget_exhausted(state):
+        return state
+
     response = codegen_llm.invoke(codegen_prompt(architecture))
+    record_llm_usage(state, [response])
 
     response_text = getattr(response, "content", str(response))
 
     files = parse_files_from_response(response_text)
 
-    write_files_to_directory(files)
+    write_files_to_directory(files, get_project_dir(state))
+
+    # Fresh project, so versions from earlier runs no longer apply
+    SnapshotStore(get_project_dir(state)).clear()
+    state["best_files"] = {}
 
     state["code_generated"] = False
-    print("✅ Code generation completed.")
     return state
 
 
 # Error Analysis Node
 
+def iter_project_files(base_dir: str) -> Iterator[Tuple[str, str]]:
+    """Yields (file_path, relative_path) for every source file worth analyzing."""
+    for root, dirs, files in os.walk(base_dir):
+        dirs[:] = [d for d in dirs if d not in ['.git', '__pycache__', 'node_modules', '.venv', 'venv']]
+        
+        for file in files:
+            if file.startswith('.') or file.endswith(('.pyc', '.pyo', '.pyd', '.so', '.dll', '.backup')):
+                continue
+            
+            ext = Path(file).suffix.lower()
+            if ext not in ['.py', '.js', '.jsx', '.ts', '.tsx', '.json', '.yaml', '.yml', 
+                          '.html', '.css', '.java', '.cpp', '.c', '.h', '.go', '.rs', '.rb']:
+                continue
+            
+            file_path = os.path.join(root, file)
+            yield file_path, os.path.relpath(file_path, base_dir)
+
+
+def analyze_file(state: AgentHubState, relative_path: str, code_content: str,
+                 previous_errors: List[str]) -> Optional[List[str]]:
+    """
+    Asks the error analysis model for the real errors in one file.
+    Returns None if the model's answer could not be parsed.
+    """
+    # Use enhanced prompt with context
+    prompt = error_analysis_prompt(relative_path, code_content, previous_errors)
+    response = error_analysis_llm.invoke(prompt)
+    record_llm_usage(state, [response])
+    
+    response_text = getattr(response, "content", str(response))
+    
+    try:
+        if "```json" in response_text:
+            json_start = response_text.find("```json") + 7
+            json_end = response_text.find("```", json_start)
+            response_text = response_text[json_start:json_end].strip()
+        elif "```" in response_text:
+            json_start = response_text.find("```") + 3
+            json_end = response_text.find("```", json_start)
+            response_text = response_text[json_start:json_end].strip()
+        
+        errors = json.loads(response_text)
+        
+        if not isinstance(errors, list):
+            errors = [str(errors)]
+        
+    except json.JSONDecodeError:
+        emit("file_analysis_failed", file=relative_path, error="Could not parse JSON response")
+        errors = None
+    
+    return errors
+
+
 def check_errors(state: AgentHubState) -> AgentHubState:
     """Enhanced error checking with iteration tracking"""
-    print("🔍 Starting LLM-based error analysis...")
-    print("="*60)
-    
-    base_dir = "my_project"
+    base_dir = get_project_dir(state)
     error_dict = {}
+    contents = {}
     total_files = 0
-    files_with_errors = 0
+    skipped_files = 0
     
     # Track iteration history
     iteration = state.get("iteration_count", 0)
     error_history = state.get("error_history", {})
     
-    print(f"🔄 Iteration: {iteration}")
-    
     if not os.path.exists(base_dir):
-        print(f"❌ Directory {base_dir} does not exist!")
+        emit("project_missing", project_dir=base_dir)
         state["errors"] = {"_global": ["Project directory not found"]}
         return state
     
-    for root, dirs, files in os.walk(base_dir):
-        dirs[:] = [d for d in dirs if d not in ['.git', '__pycache__', 'node_modules', '.venv', 'venv']]
+    for file_path, relative_path in iter_project_files(base_dir):
+        total_files += 1
         
-        for file in files:
-            if file.startswith('.') or file.endswith(('.pyc', '.pyo', '.pyd', '.so', '.dll', '.backup')):
-                continue
-            
-            ext = Path(file).suffix.lower()
-            if ext not in ['.py', '.js', '.jsx', '.ts', '.tsx', '.json', '.yaml', '.yml', 
-                          '.html', '.css', '.java', '.cpp', '.c', '.h', '.go', '.rs', '.rb']:
-                continue
-            
-            file_path = os.path.join(root, file)
-            relative_path = os.path.relpath(file_path, base_dir)
-            
-            total_files += 1
-            print(f"\n📄 Analyzing: {relative_path}")
+        # Out of budget: keep the last known errors instead of re-analyzing
+        if budget_exhausted(state):
+            if error_history.get(relative_path):
+                error_dict[relative_path] = error_history[relative_path]
+            skipped_files += 1
+            continue
+        
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                code_content = f.read()
+            contents[relative_path] = code_content
             
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    code_content = f.read()
-                
-                # Get previous errors for this file
-                previous_errors = error_history.get(relative_path, [])
-                
-                # Use enhanced prompt with context
-                prompt = error_analysis_prompt(relative_path, code_content, previous_errors)
-                response = error_analysis_llm.invoke(prompt)
-                
-                response_text = getattr(response, "content", str(response))
-                
-                try:
-                    if "```json" in response_text:
-                        json_start = response_text.find("```json") + 7
-                        json_end = response_text.find("```", json_start)
-                        response_text = response_text[json_start:json_end].strip()
-                    elif "```" in response_text:
-                        json_start = response_text.find("```") + 3
-                        json_end = response_text.find("```", json_start)
-                        response_text = response_text[json_start:json_end].strip()
-                    
-                    errors = json.loads(response_text)
-                    
-                    if not isinstance(errors, list):
-                        errors = [str(errors)]
-                    
-                except json.JSONDecodeError:
-                    print(f"   ⚠️  Could not parse JSON response")
-                    errors = []
-                
-                if errors:
-                    error_dict[relative_path] = errors
-                    files_with_errors += 1
-                    
-                    # Compare with previous iteration
-                    prev_count = len(previous_errors)
-                    curr_count = len(errors)
-                    
-                    if previous_errors:
-                        if curr_count < prev_count:
-                            print(f"   ✅ Improved! {prev_count} → {curr_count} errors")
-                        elif curr_count > prev_count:
-                            print(f"   ⚠️  Worse! {prev_count} → {curr_count} errors")
-                        else:
-                            print(f"   ⚡ Same: {curr_count} errors")
-                    else:
-                        print(f"   ❌ Found {len(errors)} issue(s)")
-                    
-                    for i, error in enumerate(errors[:2], 1): 
-                        print(f"      {i}. {error}")
-                    if len(errors) > 2:
-                        print(f"      ... and {len(errors) - 2} more")
-                else:
-                    print(f"   ✅ No errors found")
+            # Get previous errors for this file
+            previous_errors = error_history.get(relative_path, [])
             
-            except Exception as e:
-                print(f"   ⚠️  Error analyzing file: {str(e)}")
-    
-    # Calculate overall progress
-    total_errors_now = sum(len(errs) for errs in error_dict.values())
-    total_errors_prev = sum(len(errs) for errs in error_history.values())
-    
-    print("\n" + "="*60)
-    print(f"📊 Analysis Summary (Iteration {iteration}):")
-    print(f"   Total files analyzed: {total_files}")
-    print(f"   Files with issues: {files_with_errors}")
-    print(f"   Files without issues: {total_files - files_with_errors}")
-    
-    if iteration > 0:
-        print(f"\n   📈 Progress:")
-        print(f"   Previous total errors: {total_errors_prev}")
-        print(f"   Current total errors: {total_errors_now}")
-        if total_errors_now < total_errors_prev:
-            improvement = total_errors_prev - total_errors_now
-            print(f"   ✅ IMPROVED by {improvement} errors ({improvement/max(total_errors_prev,1)*100:.1f}%)")
-        elif total_errors_now > total_errors_prev:
-            regression = total_errors_now - total_errors_prev
-            print(f"   ⚠️  REGRESSED by {regression} errors")
-        else:
-            print(f"   ⚡ No change in error count")
-    
-    print("="*60)
-    
-    if error_dict:
-        print("\n⚠️  Issues found in:")
-        for filename, errors in error_dict.items():
-            print(f"   📄 {filename}: {len(errors)} issue(s)")
-    else:
+            errors = analyze_file(state, relative_path, code_content, previous_errors)
+            if errors is None:
+                # Unknown result, keep the last known errors rather than reporting it clean
+                contents.pop(relative_path, None)
+                if previous_errors:
+                    error_dict[relative_path] = previous_errors
+                skipped_files += 1
+                continue
+            if errors:
+                error_dict[relative_path] = errors
+
+            emit("file_analyzed", file=relative_path, errors=errors, previous_count=len(previous_errors))
+        
+        except Exception as e:
+            contents.pop(relative_path, None)
+            if error_history.get(relative_path):
+                error_dict[relative_path] = error_history[relative_path]
+            skipped_files += 1
+            emit("file_analysis_failed", file=relative_path, error=str(e))
+    
+    # Undo fixes that made a file worse
+    best_files = state.get("best_files", {})
+    store = SnapshotStore(base_dir)
+    for relative_path in track_best_versions(store, base_dir, contents, error_dict, best_files):
+        emit("file_rolled_back", file=relative_path, errors=len(best_files[relative_path]["errors"]))
+    state["best_files"] = best_files
+    
+    emit(
+        "errors_found",
+        iteration=iteration,
+        total_files=total_files,
+        files_with_errors=len(error_dict),
+        total_errors=sum(len(errs) for errs in error_dict.values()),
+        previous_total=sum(len(errs) for errs in error_history.values()),
+        errors={filename: len(errs) for filename, errs in error_dict.items()},
+    )
+    
+    if not error_dict and not skipped_files:
         state['code_generated'] = True
-        print("\n✅ All files passed LLM validation!")
+    elif error_dict and iteration >= MAX_ITERATIONS:
+        # error_check_router ends the fix loop here
+        emit("max_iterations", limit=MAX_ITERATIONS)
     
     state["errors"] = error_dict
     state["error_history"] = error_dict.copy()  # Store for next iteration
-    print("\n✅ Error analysis completed.")
     return state
 
 
 # Validation Node
 
 
+def finalize_best_versions(state: AgentHubState):
+    """Leaves the project at the best-known version of every file."""
+    base_dir = get_project_dir(state)
+    restored = restore_best_versions(SnapshotStore(base_dir), base_dir, state.get("best_files", {}))
+    if restored:
+        emit("best_versions_restored", files=restored)
+
+
 def testing(state: AgentHubState) -> AgentHubState:
     """
     Test for edge cases if code is generated successful and error-free.
     """
-    print("Ready with production ready code")
+    finalize_best_versions(state)
+    emit(
+        "completed",
+        code_generated=state.get("code_generated", False),
+        budget_exhausted=budget_exhausted(state),
+        usage=state.get("usage", {}),
+    )
     return state
 
 
+# Error Fixing Nodes
+
+def fix_file(state: AgentHubState, agent, filename: str, errors: List[str], original_code: str,
+             file_history: List[str], search_context: str = "") -> Tuple[Optional[str], int]:
+    """
+    Runs the error fixing agent on one file.
+    Returns the fixed code (None if the fix looks invalid) and the number
+    of agent turns that used search tools.
+    """
+    # Prepare agent input
+    errors_formatted = "\n".join([f"{i+1}. {error}" for i, error in enumerate(errors)])
+    
+    history_context = ""
+    if file_history:
+        history_context = f"\n\nPrevious fix attempts:\n" + "\n".join(file_history[-2:])
+    
+    agent_input = fix_errors_prompt(filename, history_context, errors_formatted, original_code, search_context)
+
+    # Invoke the agent; agent_config counts its LLM usage as it goes
+    try:
+        result = agent.invoke({"messages": [{"role": "user", "content": agent_input}]}, config=agent_config(state))
+    except GraphRecursionError:
+        raise agent_limit_error(state, filename)
+    
+    # Extract fixed code from agent response
+    agent_messages = result.get("messages", [])
+    if not agent_messages:
+        raise Exception("Agent returned no messages")
+    
+    # Get the last message (agent's final response)
+    fixed_code = agent_messages[-1].content
+    if fixed_code.strip() == AGENT_OUT_OF_STEPS:
+        raise agent_limit_error(state, filename)
+    
+    # Clean up if agent included markdown
+    if "```" in fixed_code:
+        lines = fixed_code.split('\n')
+        in_code_block = False
+        code_lines = []
+        
+        for line in lines:
+            if line.strip().startswith('```'):
+                in_code_block = not in_code_block
+                continue
+            if in_code_block or (not in_code_block and '```' not in line):
+                code_lines.append(line)
+        
+        fixed_code = '\n'.join(code_lines)
+    
+    fixed_code = fixed_code.strip()
+    
+    # Check if agent used search tools
+    tool_calls = [msg for msg in agent_messages if hasattr(msg, 'tool_calls') and msg.tool_calls]
+    if tool_calls:
+        emit("search_used", file=filename, count=len(tool_calls))
+    
+    # Validate fix
+    if not fixed_code or len(fixed_code) < len(original_code) * 0.3:
+        return None, len(tool_calls)
+    
+    return fixed_code, len(tool_calls)
+
+
+def agent_limit_error(state: AgentHubState, filename: str) -> Exception:
+    """The agent ran out of steps: either max_agent_steps or the run's LLM calls."""
+    reason = budget_exhausted(state)
+    return BudgetExhaustedError(reason) if reason else AgentStepLimitError(filename)
+
+
+def budget_exhausted_reason(error: BudgetExhaustedError) -> str:
+    return f"Run budget exhausted ({error}), keeping original"
+
+
+def agent_step_limit_reason(state: AgentHubState) -> str:
+    max_steps = state.get("budget", {}).get("max_agent_steps")
+    return f"Agent step budget exhausted (max_agent_steps={max_steps}), keeping original"
+
+
 def handle_errors(state: AgentHubState) -> AgentHubState:
     """
     Uses an agentic approach with web search to fix errors.
@@ -309,49 +462,46 @@ def handle_errors(state: AgentHubState) -> AgentHubState:
     error_dict = state.get("errors", {})
     
     if not error_dict:
-        print("✅ No errors to fix!")
         state["errors_fixed"] = True
         return state
     
     iteration = state.get("iteration_count", 0)
     fix_history = state.get("fix_history", {})
     
-    print("🤖 Starting AGENTIC error fixing process...")
-    print(f"🔄 Iteration: {iteration}")
-    print("="*60)
-    
-    base_dir = "my_project"
+    base_dir = get_project_dir(state)
     fixed_files = []
     failed_files = []
     total_errors_fixed = 0
     
-    # Limit iterations
-    MAX_ITERATIONS = 5
-    if iteration >= MAX_ITERATIONS:
-        print(f"⚠️  Reached maximum iterations ({MAX_ITERATIONS}). Stopping.")
-        state["errors_fixed"] = True
-        return state
-    
     # Create the agent once per iteration
     try:
-        agent = create_error_fixing_agent()
+        tools = setup_search_tools()
+        agent = create_error_fixing_agent(tools)
     except Exception as e:
-        print(f"❌ Failed to create agent: {e}")
+        emit("agent_unavailable", error=str(e))
         return state
     
+    # Search for every file's errors at once instead of inside each agent run;
+    # results are kept for the run so later iterations don't search again
+    search_context = {}
+    if not budget_exhausted(state):
+        search_results = state.setdefault("search_results", {})
+        with SearchPrefetcher(tools, PREFETCH_MAX_QUERIES, PREFETCH_WORKERS, search_results) as prefetcher:
+            search_context = prefetcher.prefetch(error_dict, base_dir, timeout=time_left(state))
+    
     # Process each file with errors
     for filename, errors in error_dict.items():
         if not errors:
             continue
         
-        file_path = os.path.join(base_dir, filename)
+        if budget_exhausted(state):
+            break
         
-        print(f"\n📄 Fixing: {filename}")
-        print(f"   Errors to fix: {len(errors)}")
+        file_path = os.path.join(base_dir, filename)
         
         try:
             if not os.path.exists(file_path):
-                print(f"   ❌ File not found: {file_path}")
+                emit("fix_failed", file=filename, reason=f"File not found: {file_path}")
                 failed_files.append(filename)
                 continue
             
@@ -362,98 +512,244 @@ def handle_errors(state: AgentHubState) -> AgentHubState:
             # Get fix history
             file_history = fix_history.get(filename, [])
             
-            # Prepare agent input
-            errors_formatted = "\n".join([f"{i+1}. {error}" for i, error in enumerate(errors)])
-            
-            history_context = ""
-            if file_history:
-                history_context = f"\n\nPrevious fix attempts:\n" + "\n".join(file_history[-2:])
-            
-            agent_input = fix_errors_prompt(filename, history_context, errors_formatted, original_code)
-
-            print(f"   🤖 Agent is analyzing and fixing...")
-            print(f"   🔍 Agent can search web for solutions...")
-            
-            # Invoke the agent
-            result = agent.invoke({"messages": [{"role": "user", "content": agent_input}]})
-            
-            # Extract fixed code from agent response
-            agent_messages = result.get("messages", [])
-            if not agent_messages:
-                raise Exception("Agent returned no messages")
-            
-            # Get the last message (agent's final response)
-            fixed_code = agent_messages[-1].content
-            
-            # Clean up if agent included markdown
-            if "```" in fixed_code:
-                lines = fixed_code.split('\n')
-                in_code_block = False
-                code_lines = []
-                
-                for line in lines:
-                    if line.strip().startswith('```'):
-                        in_code_block = not in_code_block
-                        continue
-                    if in_code_block or (not in_code_block and '```' not in line):
-                        code_lines.append(line)
-                
-                fixed_code = '\n'.join(code_lines)
-            
-            fixed_code = fixed_code.strip()
-            
-            # Validate fix
-            if not fixed_code or len(fixed_code) < len(original_code) * 0.3:
-                print(f"   ⚠️  Fix seems invalid (too small), keeping original")
+            try:
+                fixed_code, searches = fix_file(
+                    state, agent, filename, errors, original_code, file_history, search_context.get(filename, "")
+                )
+            except AgentStepLimitError:
+                emit("fix_failed", file=filename, reason=agent_step_limit_reason(state))
+                failed_files.append(filename)
+                continue
+            except BudgetExhaustedError as e:
+                emit("fix_failed", file=filename, reason=budget_exhausted_reason(e))
+                failed_files.append(filename)
+                break
+            if fixed_code is None:
+                emit("fix_failed", file=filename, reason="Fix seems invalid (too small), keeping original")
                 failed_files.append(filename)
                 continue
-            
-            # Check if agent used search tools
-            tool_calls = [msg for msg in agent_messages if hasattr(msg, 'tool_calls') and msg.tool_calls]
-            if tool_calls:
-                print(f"   🔍 Agent used {len(tool_calls)} search(es) to find solutions")
             
             # Write fixed code
             with open(file_path, 'w', encoding='utf-8') as f:
                 f.write(fixed_code)
             
             # Update history
-            search_note = f" (used {len(tool_calls)} searches)" if tool_calls else ""
+            search_note = f" (used {searches} searches)" if searches else ""
             file_history.append(f"Iteration {iteration}: Fixed {len(errors)} errors{search_note}")
             fix_history[filename] = file_history
             
             fixed_files.append(filename)
             total_errors_fixed += len(errors)
-            print(f"   ✅ Fixed and saved!")
-            print(f"      Lines: {len(original_code.splitlines())} → {len(fixed_code.splitlines())}")
+            emit(
+                "fix_applied",
+                file=filename,
+                error_count=len(errors),
+                searches=searches,
+                lines_before=len(original_code.splitlines()),
+                lines_after=len(fixed_code.splitlines()),
+            )
         
         except Exception as e:
-            print(f"   ❌ Failed to fix: {str(e)}")
+            emit("fix_failed", file=filename, reason=f"Failed to fix: {str(e)}")
             failed_files.append(filename)
         
     
-    # Summary
-    print("\n" + "="*60)
-    print(f"📊 Agentic Fixing Summary (Iteration {iteration}):")
-    print(f"   Total files processed: {len(error_dict)}")
-    print(f"   Successfully fixed: {len(fixed_files)}")
-    print(f"   Failed to fix: {len(failed_files)}")
-    print(f"   Total errors addressed: {total_errors_fixed}")
-    print("="*60)
-    
-    if fixed_files:
-        print("\n✅ Successfully fixed:")
-        for filename in fixed_files:
-            print(f"   📄 {filename}")
-    
-    if failed_files:
-        print("\n❌ Failed to fix:")
-        for filename in failed_files:
-            print(f"   📄 {filename}")
+    emit(
+        "fix_summary",
+        iteration=iteration,
+        fixed=fixed_files,
+        failed=failed_files,
+        errors_addressed=total_errors_fixed,
+    )
     
     # Update state
     state["errors"] = {}
     state["fix_history"] = fix_history
     state["iteration_count"] = iteration + 1
     
-    return state
\ No newline at end of file
+    return state
+
+
+def run_file_pipeline(state: AgentHubState, agent, prefetcher: SearchPrefetcher, store: SnapshotStore,
+                      base_dir: str, relative_path: str, previous_errors: List[str],
+                      file_history: List[str], max_iterations: int = MAX_ITERATIONS,
+                      recheck: bool = False) -> Dict[str, Any]:
+    """
+    Independent analyze -> fix -> re-analyze loop for a single file.
+    A fix that adds errors is reverted and the loop keeps the best version.
+    A `recheck` only re-analyzes the file, and fixes it only if new errors
+    appeared since `previous_errors`.
+    """
+    file_path = os.path.join(base_dir, relative_path)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        best_code = f.read()
+    interface_before = public_interface(relative_path, best_code)
+    
+    # Out of budget: keep the last known errors instead of re-analyzing
+    errors = None
+    if not budget_exhausted(state):
+        errors = analyze_file(state, relative_path, best_code, previous_errors)
+    skipped = errors is None
+    if skipped:
+        errors = previous_errors
+    else:
+        emit("file_analyzed", file=relative_path, errors=errors, previous_count=len(previous_errors))
+    
+    if recheck and len(errors) <= len(previous_errors):
+        max_iterations = 0
+    
+    iteration = 0
+    while errors and iteration < max_iterations and not budget_exhausted(state):
+        try:
+            search_context = prefetcher.prefetch(
+                {relative_path: errors}, base_dir, timeout=time_left(state)
+            ).get(relative_path, "")
+            fixed_code, searches = fix_file(
+                state, agent, relative_path, errors, best_code, file_history, search_context
+            )
+        except AgentStepLimitError:
+            emit("fix_failed", file=relative_path, reason=agent_step_limit_reason(state))
+            break
+        except BudgetExhaustedError as e:
+            emit("fix_failed", file=relative_path, reason=budget_exhausted_reason(e))
+            break
+        except Exception as e:
+            emit("fix_failed", file=relative_path, reason=f"Failed to fix: {str(e)}")
+            break
+        iteration += 1
+        if fixed_code is None:
+            emit("fix_failed", file=relative_path, reason="Fix seems invalid (too small), keeping original")
+            continue
+        
+        if budget_exhausted(state):
+            # No budget left to verify the fix, so it can't replace the best version
+            break
+        new_errors = analyze_file(state, relative_path, fixed_code, errors)
+        search_note = f" (used {searches} searches)" if searches else ""
+        if new_errors is None:
+            # The fix couldn't be verified, so it can't replace the best version
+            file_history.append(f"Iteration {iteration}: Fix could not be verified, discarded{search_note}")
+            continue
+        emit("file_analyzed", file=relative_path, errors=new_errors, previous_count=len(errors))
+        
+        if len(new_errors) > len(errors):
+            file_history.append(f"Iteration {iteration}: Fix introduced {len(new_errors)} errors, reverted{search_note}")
+            emit("file_rolled_back", file=relative_path, errors=len(errors))
+            continue
+        
+        file_history.append(f"Iteration {iteration}: Fixed {len(errors)} errors{search_note}")
+        emit(
+            "fix_applied",
+            file=relative_path,
+            error_count=len(errors),
+            searches=searches,
+            lines_before=len(best_code.splitlines()),
+            lines_after=len(fixed_code.splitlines()),
+        )
+        best_code, errors = fixed_code, new_errors
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(best_code)
+    
+    return {
+        "file": relative_path,
+        "errors": errors,
+        "hash": store.put(best_code),
+        "history": file_history,
+        "iterations": iteration,
+        "interface_changed": public_interface(relative_path, best_code) != interface_before,
+        "skipped": skipped,
+    }
+
+
+def fix_pipelines(state: AgentHubState) -> AgentHubState:
+    """
+    Runs an independent analyze -> fix -> re-analyze pipeline per file,
+    concurrently, instead of project-wide check/fix rounds. Files that
+    import a module whose public interface changed are re-analyzed once
+    after the first pass, and only fixed again if that added errors.
+    """
+    base_dir = get_project_dir(state)
+    if not os.path.exists(base_dir):
+        emit("project_missing", project_dir=base_dir)
+        state["errors"] = {"_global": ["Project directory not found"]}
+        return state
+    
+    try:
+        tools = setup_search_tools()
+        agent = create_error_fixing_agent(tools)
+    except Exception as e:
+        emit("agent_unavailable", error=str(e))
+        return state
+    
+    store = SnapshotStore(base_dir)
+    error_history = state.get("error_history", {})
+    fix_history = state.get("fix_history", {})
+    best_files = state.get("best_files", {})
+    results = {}
+    failed = set()
+    
+    def run_all(paths: List[str], recheck: bool = False):
+        with ThreadPoolExecutor(max_workers=PIPELINE_WORKERS) as executor:
+            futures = {
+                # Copy the context so events reach this run's subscribers and stream
+                executor.submit(
+                    contextvars.copy_context().run, run_file_pipeline, state, agent, prefetcher, store, base_dir, path,
+                    results[path]["errors"] if path in results else error_history.get(path, []),
+                    list(results[path]["history"] if path in results else fix_history.get(path, [])),
+                    MAX_ITERATIONS - (results[path]["iterations"] if path in results else 0),
+                    recheck,
+                ): path
+                for path in paths
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failed.add(futures[future])
+                    emit("file_analysis_failed", file=futures[future], error=str(e))
+                    continue
+                if result["file"] in results:
+                    # Report the rounds of both passes
+                    result["iterations"] += results[result["file"]]["iterations"]
+                failed.discard(result["file"])
+                results[result["file"]] = result
+                emit("pipeline_finished", file=result["file"], errors=len(result["errors"]),
+                     iterations=result["iterations"])
+    
+    paths = [relative_path for _, relative_path in iter_project_files(base_dir)]
+    # Shared by all pipelines so a query needed by several files runs once
+    with SearchPrefetcher(tools, PREFETCH_MAX_QUERIES, PREFETCH_WORKERS) as prefetcher:
+        run_all(paths)
+        
+        changed = [path for path, result in results.items() if result["interface_changed"]]
+        dependents = find_dependents(base_dir, paths, changed)
+        if dependents:
+            emit("interface_changed", files=changed, rechecking=dependents)
+            run_all(dependents, recheck=True)
+    
+    error_dict = {path: error_history[path] for path in failed if error_history.get(path)}
+    for path, result in results.items():
+        if result["errors"]:
+            error_dict[path] = result["errors"]
+        best_files[path] = {"hash": result["hash"], "errors": result["errors"]}
+        fix_history[path] = result["history"]
+    
+    emit(
+        "errors_found",
+        iteration=max((result["iterations"] for result in results.values()), default=0),
+        total_files=len(paths),
+        files_with_errors=len(error_dict),
+        total_errors=sum(len(errs) for errs in error_dict.values()),
+        previous_total=sum(len(errs) for errs in error_history.values()),
+        errors={filename: len(errs) for filename, errs in error_dict.items()},
+    )
+    
+    state["code_generated"] = (
+        not error_dict and not failed and not any(result["skipped"] for result in results.values())
+    )
+    state["errors"] = error_dict
+    state["error_history"] = error_dict.copy()
+    state["fix_history"] = fix_history
+    state["best_files"] = best_files
+    state["iteration_count"] = max((result["iterations"] for result in results.values()), default=0)
+    return state
@@ -55,9 +55,15 @@ Now analyze the idea and output the JSON. USER IDEA: "{user_input}"
 '''
 
 
-def fix_errors_prompt(filename, history_context, errors_formatted, original_code) -> str:
+def fix_errors_prompt(filename, history_context, errors_formatted, original_code, search_context="") -> str:
     """Enhanced fixing prompt with better context"""
     
+    if search_context:
+        search_context = f"""
+SEARCH RESULTS (already gathered for these errors, prefer them over new searches):
+{search_context}
+"""
+    
     return f"""
 Fix the following code file.
 
@@ -66,7 +72,7 @@ Filename: {filename}
 
 ERRORS TO FIX:
 {errors_formatted}
-
+{search_context}
 CURRENT CODE:
 ```
 {original_code}
@@ -74,7 +80,7 @@ CURRENT CODE:
 
 INSTRUCTIONS:
 1. For each error, decide if you need to search for a solution
-2. If unfamiliar or library-specific, USE THE SEARCH TOOL
+2. If unfamiliar or library-specific and not covered by the search results above, USE THE SEARCH TOOL
 3. Apply fixes with minimal changes
 4. Return ONLY the complete fixed code (no markdown, no explanations)
 
@@ -1,10 +1,30 @@
 from src.utils.state import AgentHubState
+from src.utils.budget import budget_exhausted
+from src.utils.nodes import MAX_ITERATIONS
+
+import os
 
 def error_check_router(state: AgentHubState):
     """
-    Router function to determine if errors are present.
+    Router function to determine if errors are present and another fix
+    round is allowed.
+    """
+    if state["errors"] == {} or budget_exhausted(state) or state.get("iteration_count", 0) >= MAX_ITERATIONS:
+        return "testing"
+    else:
+        return "handle_errors"
+
+
+def fix_mode_router(state: AgentHubState):
+    """
+    Router function to pick between project-wide check/fix rounds ("batch")
+    and independent per-file pipelines ("pipeline"), or to stop early when
+    the run is out of budget.
     """
-    if state["errors"] == {}:
+    fix_mode = state.get("fix_mode") or os.getenv("AGENT_HUB_FIX_MODE", "batch")
+    if budget_exhausted(state):
         return "testing"
+    elif fix_mode == "pipeline":
+        return "fix_pipelines"
     else:
-        return "handle_errors"
\ No newline at end of file
+        return "check_errors"
@@ -0,0 +1,214 @@
+from src.utils.events import emit
+
+import os
+import re
+import ast
+import threading
+import contextvars
+
+from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+
+LANGUAGES = {
+    ".py": "python", ".js": "javascript", ".jsx": "javascript", ".ts": "typescript",
+    ".tsx": "typescript", ".java": "java", ".go": "go", ".rs": "rust", ".rb": "ruby",
+    ".c": "c", ".cpp": "c++", ".h": "c", ".yaml": "yaml", ".yml": "yaml", ".json": "json",
+}
+
+MISSING_MODULE = re.compile(r"No module named ['\"]?([\w.]+)")
+IMPORT_NAME = re.compile(r"cannot import name ['\"]?(\w+)['\"]? from ['\"]?([\w.]+)")
+EXCEPTION_TYPE = re.compile(r"\b([A-Z]\w*(?:Error|Exception|Warning))\b")
+IMPORT_STATEMENT = re.compile(r"^[ \t]*(?:from[ \t]+\S+[ \t]+import[ \t]*\([^)]*\)|(?:from|import)[ \t].*)", re.MULTILINE)
+QUOTED_IDENTIFIER = re.compile(r"['\"`]([A-Za-z_][\w.]*)['\"`]")
+QUOTED_TEXT = re.compile(r"['\"`].*?['\"`]")
+LINE_REFERENCE = re.compile(r"\b[Ll]ine \d+:?")
+
+# Errors the model can fix without looking anything up
+LOCAL_ERRORS = {"SyntaxError", "IndentationError", "TabError", "NameError", "UnboundLocalError"}
+
+SNIPPET_CHARS = 600
+
+
+def imported_names(code: str) -> Dict[str, str]:
+    """
+    Maps the names a Python file binds through imports to the top-level
+    package they come from: `from langgraph.graph import StateGraph` gives
+    StateGraph -> langgraph and langgraph -> langgraph.
+    """
+    try:
+        nodes = list(ast.walk(ast.parse(code)))
+    except SyntaxError:
+        # The file itself is broken, parse its import statements one by one
+        nodes = []
+        for statement in IMPORT_STATEMENT.findall(code):
+            try:
+                nodes.extend(ast.parse(statement.strip()).body)
+            except SyntaxError:
+                continue
+
+    names = {}
+    for node in nodes:
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                package = alias.name.split(".")[0]
+                names[alias.asname or package] = package
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            package = node.module.split(".")[0]
+            names[package] = package
+            for alias in node.names:
+                if alias.name != "*":
+                    names[alias.asname or alias.name] = package
+    return names
+
+
+def extract_search_queries(filename: str, errors: List[str], code: str = "", max_queries: int = 3) -> List[str]:
+    """
+    Turns error messages into web search queries, keyed on library names
+    and exception types. Plain syntax/name errors don't produce queries.
+    """
+    language = LANGUAGES.get(os.path.splitext(filename)[1].lower(), "")
+    names = imported_names(code) if language == "python" else {}
+
+    queries = []
+    for error in errors:
+        error = str(error)
+        query = None
+        if match := MISSING_MODULE.search(error):
+            query = f"{language} ModuleNotFoundError No module named {match.group(1)}"
+        elif match := IMPORT_NAME.search(error):
+            query = f"{language} cannot import name {match.group(1)} from {match.group(2)}"
+        else:
+            exception = EXCEPTION_TYPE.search(error)
+            if exception and exception.group(1) in LOCAL_ERRORS:
+                continue
+            # Imported names the error mentions, in the order they appear
+            mentioned = sorted(
+                (match.start(), names[match.group(0)])
+                for match in re.finditer(r"\b[A-Za-z_]\w*\b", error) if match.group(0) in names
+            )
+            libraries = [package for _, package in mentioned]
+            if libraries or exception:
+                # Line references and quoted free text vary per project, but a
+                # quoted identifier names the API or key at fault, so keep it
+                summary = LINE_REFERENCE.sub(" ", error)
+                summary = QUOTED_TEXT.sub(" ", QUOTED_IDENTIFIER.sub(r"\1", summary))
+                summary = " ".join(summary.split()[:12])
+                library = libraries[0] if libraries and not re.search(rf"\b{libraries[0]}\b", summary) else ""
+                query = " ".join(filter(None, [language, library, summary]))
+
+        if query and query not in queries:
+            queries.append(query)
+        if len(queries) >= max_queries:
+            break
+    return queries
+
+
+def _snippets(result: Any) -> List[Tuple[str, str]]:
+    """Normalizes a search tool result into (key, text) pairs."""
+    if isinstance(result, list):
+        snippets = []
+        for item in result:
+            if isinstance(item, dict):
+                text = item.get("content") or item.get("snippet") or ""
+                source = item.get("url") or ""
+                snippets.append((source or text, f"{source}\n{text}".strip()))
+            else:
+                snippets.append((str(item), str(item)))
+        return snippets
+    if isinstance(result, dict) and "results" in result:
+        return _snippets(result["results"])
+    return [(str(result), str(result))]
+
+
+class SearchPrefetcher:
+    """
+    Runs the searches the error fixing agent would otherwise issue one at
+    a time, concurrently and up front. Identical queries coming from
+    different files are only searched once. Finished searches are kept in
+    `results`, so passing the same dict to later prefetchers of a run
+    reuses them.
+    """
+
+    def __init__(self, tools: List[Any], max_queries_per_file: int = 3, workers: int = 8,
+                 results: Optional[Dict[str, List[Tuple[str, str]]]] = None):
+        self.tools = tools
+        self.max_queries_per_file = max_queries_per_file
+        self.results = {} if results is None else results
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._searches: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _search(self, query: str) -> List[Tuple[str, str]]:
+        # First configured tool that answers wins (Tavily before DuckDuckGo)
+        for tool in self.tools:
+            try:
+                return _snippets(tool.invoke(query))
+            except Exception as e:
+                emit("search_failed", query=query, tool=getattr(tool, "name", str(tool)), error=str(e))
+        return []
+
+    def _submit(self, query: str) -> Future:
+        with self._lock:
+            if query in self._searches:
+                return self._searches[query]
+            if query in self.results:
+                future = Future()
+                future.set_result(self.results[query])
+            else:
+                future = self._executor.submit(contextvars.copy_context().run, self._search, query)
+            self._searches[query] = future
+            return future
+
+    def prefetch(self, errors_by_file: Dict[str, List[str]], base_dir: str,
+                 timeout: Optional[float] = None) -> Dict[str, str]:
+        """
+        Searches for the errors of every file at once and returns a
+        deduplicated block of result snippets per file. Searches still
+        running after `timeout` seconds are left out.
+        """
+        if not self.tools or self.max_queries_per_file <= 0:
+            return {}
+
+        queries_by_file = {}
+        for filename, errors in errors_by_file.items():
+            try:
+                with open(os.path.join(base_dir, filename), "r", encoding="utf-8") as f:
+                    code = f.read()
+            except OSError:
+                code = ""
+            queries = extract_search_queries(filename, errors, code, self.max_queries_per_file)
+            if queries:
+                queries_by_file[filename] = queries
+
+        searches = {query: self._submit(query) for queries in queries_by_file.values() for query in queries}
+        if not searches:
+            return {}
+        done, _ = wait(searches.values(), timeout=timeout)
+        emit("search_prefetched", queries=len(searches), completed=len(done), files=len(queries_by_file))
+        for query, search in searches.items():
+            # Searches where every tool failed are tried again next time
+            if search in done and search.result():
+                self.results[query] = search.result()
+
+        context = {}
+        for filename, queries in queries_by_file.items():
+            seen = set()
+            blocks = []
+            for query in queries:
+                if searches[query] not in done:
+                    continue
+                for key, text in searches[query].result():
+                    if key in seen or not text:
+                        continue
+                    seen.add(key)
+                    blocks.append(f"[{query}]\n{text[:SNIPPET_CHARS]}")
+            if blocks:
+                context[filename] = "\n\n".join(blocks)
+        return context
@@ -0,0 +1,96 @@
+import os
+import shutil
+import threading
+import hashlib
+
+from typing import Any, Dict, List
+
+
+class SnapshotStore:
+    """
+    Content-addressed store of project file versions, kept next to the
+    project directory. Each distinct file content is stored once under its
+    SHA-256, so re-snapshotting unchanged files costs nothing.
+    """
+
+    def __init__(self, project_dir: str):
+        project_dir = os.path.abspath(project_dir)
+        self.root = os.path.join(os.path.dirname(project_dir), f".{os.path.basename(project_dir)}_snapshots")
+
+    @staticmethod
+    def digest(content: str) -> str:
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:])
+
+    def put(self, content: str) -> str:
+        digest = self.digest(content)
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        return digest
+
+    def get(self, digest: str) -> str:
+        with open(self._object_path(digest), "r", encoding="utf-8") as f:
+            return f.read()
+
+    def restore(self, project_dir: str, relative_path: str, digest: str):
+        file_path = os.path.join(project_dir, relative_path)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(self.get(digest))
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def track_best_versions(store: SnapshotStore, project_dir: str, contents: Dict[str, str],
+                        error_dict: Dict[str, List[str]], best_files: Dict[str, Dict[str, Any]]) -> List[str]:
+    """
+    Snapshots the analyzed files and compares them with their best-known
+    version. Files whose content changed and whose error count went up are
+    restored to that version, and error_dict is updated to the errors of
+    the restored content. Files that failed analysis must be left out of
+    `contents`.
+    Returns the rolled back paths.
+    """
+    rolled_back = []
+    for relative_path, content in contents.items():
+        digest = store.put(content)
+        errors = error_dict.get(relative_path, [])
+        best = best_files.get(relative_path)
+
+        # Same content re-analyzed: the new errors are the better information
+        if best is None or digest == best["hash"] or len(errors) <= len(best["errors"]):
+            best_files[relative_path] = {"hash": digest, "errors": errors}
+            continue
+
+        store.restore(project_dir, relative_path, best["hash"])
+        if best["errors"]:
+            error_dict[relative_path] = best["errors"]
+        else:
+            error_dict.pop(relative_path, None)
+        rolled_back.append(relative_path)
+
+    return rolled_back
+
+
+def restore_best_versions(store: SnapshotStore, project_dir: str, best_files: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Puts every file back to its best-known version. Returns the restored paths."""
+    restored = []
+    for relative_path, best in best_files.items():
+        file_path = os.path.join(project_dir, relative_path)
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                current = store.digest(f.read())
+        except FileNotFoundError:
+            current = None
+        if current != best["hash"]:
+            store.restore(project_dir, relative_path, best["hash"])
+            restored.append(relative_path)
+    return restored
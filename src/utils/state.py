@@ -2,10 +2,16 @@ from typing import TypedDict, Dict, Any, List
 
 class AgentHubState(TypedDict):
     user_idea: str
+    project_dir: str
+    fix_mode: str
     architecture: Dict[str, Any]
     code_generated: bool
     errors: Dict[Any, Any]
     iteration_count: int
     error_history: Dict[str, List[str]]
     fix_history: Dict[str, List[str]]
+    best_files: Dict[str, Dict[str, Any]]
+    search_results: Dict[str, List[Any]]
+    budget: Dict[str, Any]
+    usage: Dict[str, Any]
 
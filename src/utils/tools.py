@@ -1,6 +1,7 @@
 from langchain_community.tools.tavily_search import TavilySearchResults
 from langchain_community.tools.ddg_search import DuckDuckGoSearchRun
 from src.llm.llms import codegen_llm
+from src.utils.events import emit
 from langgraph.prebuilt import create_react_agent
 from dotenv import load_dotenv
 import os
@@ -23,25 +24,26 @@ def setup_search_tools():
             include_raw_content=False
         )
         tools.append(tavily_search)
-        print("✅ Tavily search tool loaded")
+        emit("tool_loaded", tool="Tavily")
     except Exception as e:
-        print(f"⚠️  Tavily not available: {e}")
+        emit("tool_unavailable", tool="Tavily", error=str(e))
     
     # Add DuckDuckGo as fallback
     try:
         ddg_search = DuckDuckGoSearchRun()
         tools.append(ddg_search)
-        print("✅ DuckDuckGo search tool loaded")
+        emit("tool_loaded", tool="DuckDuckGo")
     except Exception as e:
-        print(f"⚠️  DuckDuckGo not available: {e}")
+        emit("tool_unavailable", tool="DuckDuckGo", error=str(e))
     
     return tools
 
 
-def create_error_fixing_agent():
+def create_error_fixing_agent(tools=None):
     """Creates a ReAct agent with search tools for fixing errors"""
     
-    tools = setup_search_tools()
+    if tools is None:
+        tools = setup_search_tools()
     
     system_prompt = """You are an expert code fixer with access to web search tools.
 
@@ -52,6 +54,7 @@ Your task is to fix code errors by:
 4. Ensuring the code remains functional
 
 WHEN TO USE SEARCH TOOLS:
+- Only if the SEARCH RESULTS already provided don't cover the error
 - For library-specific errors (import errors, API changes)
 - For unfamiliar error messages
 - To find best practices for specific frameworks